@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark for PDF resume text extraction
+Generates a corpus of multi-page PDFs and compares the original serial
+extraction loop against the budgeted, page-parallel extraction engine
+"""
+
+import argparse
+import io
+import statistics
+import time
+
+import PyPDF2
+
+from pdf_extractor import extract_pdf_text, shutdown_executor
+
+LINE = "Senior Software Engineer with experience in Python, FastAPI, React and cloud platforms."
+
+def build_pdf(page_count, lines_per_page=45):
+    """Build a simple text PDF with the given number of pages"""
+    objects = []
+    page_ids = []
+    font_id = 3
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(None)  # Pages tree, filled in once page ids are known
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    for page_number in range(page_count):
+        lines = [f"BT /F1 10 Tf 40 {780 - i * 16} Td (Page {page_number + 1} line {i + 1}: {LINE}) Tj ET"
+                 for i in range(lines_per_page)]
+        stream = "\n".join(lines).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (font_id, content_id)
+        )
+        page_ids.append(len(objects))
+
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, page_count)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref_offset = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset))
+    return out.getvalue()
+
+def extract_serial_baseline(content):
+    """Original extraction loop: every page, serial, string concatenation"""
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
+    text = ""
+    for page in pdf_reader.pages:
+        text += page.extract_text() + "\n"
+    return text
+
+def time_call(func, repeat):
+    """Return the median wall time in milliseconds and the last result"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF text extraction")
+    parser.add_argument("--pages", type=int, nargs="+", default=[2, 10, 50, 200],
+                        help="Page counts of the generated PDFs")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes for parallel extraction")
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'baseline ms':>12} {'serial ms':>10} {'unbounded ms':>13} "
+          f"{'budgeted ms':>12} {'chars-only ms':>14} {'chars':>8}")
+    for page_count in args.pages:
+        content = build_pdf(page_count)
+        # Warm up the worker pool so process start-up is not counted
+        extract_pdf_text(content, max_pages=0, max_chars=0, workers=args.workers, parallel_min_pages=0)
+
+        baseline_ms, baseline_text = time_call(lambda: extract_serial_baseline(content), args.repeat)
+        serial_ms, _ = time_call(
+            lambda: extract_pdf_text(content, max_pages=0, max_chars=0, workers=1), args.repeat)
+        unbounded_ms, unbounded_text = time_call(
+            lambda: extract_pdf_text(content, max_pages=0, max_chars=0, workers=args.workers), args.repeat)
+        budgeted_ms, budgeted_text = time_call(
+            lambda: extract_pdf_text(content, workers=args.workers), args.repeat)
+        # Character budget only: long PDFs take the parallel path, so this shows
+        # whether reaching the budget stops the workers early
+        chars_only_ms, _ = time_call(
+            lambda: extract_pdf_text(content, max_pages=0, workers=args.workers), args.repeat)
+
+        if unbounded_text != baseline_text:
+            print(f"WARNING: unbounded extraction differs from baseline for {page_count} pages")
+        print(f"{page_count:>6} {baseline_ms:>12.1f} {serial_ms:>10.1f} {unbounded_ms:>13.1f} "
+              f"{budgeted_ms:>12.1f} {chars_only_ms:>14.1f} {len(budgeted_text):>8}")
+
+    shutdown_executor()
+
+if __name__ == "__main__":
+    main()
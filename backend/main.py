@@ -1,5 +1,6 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File, Depends
+from fastapi import FastAPI, HTTPException, UploadFile, File, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 import ollama
@@ -11,12 +12,15 @@ from dotenv import load_dotenv
 import logging
 import aiofiles
 from docx import Document
-import PyPDF2
 import io
 
 # Load environment variables
 load_dotenv()
 
+# Local modules read their configuration from the environment on import
+from pdf_extractor import extract_pdf_text, shutdown_executor, start_executor
+from rate_limiter import RateLimitMiddleware, create_backend, llm_scheduler
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,6 +31,9 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Rate limiting middleware (registered before CORS so 429 responses still carry CORS headers)
+app.add_middleware(RateLimitMiddleware, backend=create_backend())
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -34,6 +41,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "Retry-After"],
 )
 
 # Pydantic models
@@ -160,7 +168,7 @@ async def extract_text_from_file(file: UploadFile) -> str:
     
     # Try content type first, then fall back to extension
     if file.content_type == "application/pdf" or file_extension == "pdf":
-        return extract_text_from_pdf(content)
+        return await run_in_threadpool(extract_text_from_pdf, content)
     elif (file.content_type in ["application/msword", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"] or 
           file_extension in ["doc", "docx"]):
         return extract_text_from_docx(content)
@@ -176,7 +184,7 @@ async def extract_text_from_file(file: UploadFile) -> str:
     else:
         # Try to detect file type by content
         if content.startswith(b'%PDF'):
-            return extract_text_from_pdf(content)
+            return await run_in_threadpool(extract_text_from_pdf, content)
         elif content.startswith(b'PK'):  # ZIP-based format (DOCX)
             return extract_text_from_docx(content)
         else:
@@ -187,16 +195,8 @@ async def extract_text_from_file(file: UploadFile) -> str:
                 return content.decode('utf-8', errors='ignore')
 
 def extract_text_from_pdf(content: bytes) -> str:
-    """Extract text from PDF content"""
-    try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
-    except Exception as e:
-        logger.error(f"Error extracting PDF text: {e}")
-        return ""
+    """Extract text from PDF content, stopping once enough text for resume parsing is read"""
+    return extract_pdf_text(content)
 
 def extract_text_from_docx(content: bytes) -> str:
     """Extract text from DOCX content"""
@@ -210,7 +210,7 @@ def extract_text_from_docx(content: bytes) -> str:
         logger.error(f"Error extracting DOCX text: {e}")
         return ""
 
-async def parse_resume_with_ai(text: str) -> ResumeData:
+async def parse_resume_with_ai(text: str, client_id: str) -> ResumeData:
     """Parse resume text using AI to extract structured data"""
     if not ollama_client:
         return ResumeData()  # Return empty data if AI not available
@@ -231,19 +231,21 @@ Resume text:
 
 Return only valid JSON, no additional text."""
 
-        response = ollama_client.chat(
-            model='llama3',
-            messages=[
-                {
-                    'role': 'system',
-                    'content': 'You are a resume parser. Extract structured information from resume text and return valid JSON only.'
-                },
-                {
-                    'role': 'user',
-                    'content': prompt
-                }
-            ]
-        )
+        async with llm_scheduler.slot(client_id):
+            response = await run_in_threadpool(
+                ollama_client.chat,
+                model='llama3',
+                messages=[
+                    {
+                        'role': 'system',
+                        'content': 'You are a resume parser. Extract structured information from resume text and return valid JSON only.'
+                    },
+                    {
+                        'role': 'user',
+                        'content': prompt
+                    }
+                ]
+            )
         
         # Parse the AI response as JSON
         ai_response = response['message']['content']
@@ -260,6 +262,14 @@ Return only valid JSON, no additional text."""
         logger.error(f"Error parsing resume with AI: {e}")
         return ResumeData()  # Return empty data on error
 
+@app.on_event("startup")
+async def start_pdf_workers():
+    await run_in_threadpool(start_executor)
+
+@app.on_event("shutdown")
+async def shutdown_pdf_workers():
+    shutdown_executor()
+
 @app.get("/")
 async def root():
     return {"message": "Mirah Voice API is running", "status": "healthy"}
@@ -296,7 +306,7 @@ async def get_interview_types():
     ]
 
 @app.post("/api/upload-resume", response_model=ResumeUploadResponse)
-async def upload_resume(file: UploadFile = File(..., alias="resume")):
+async def upload_resume(http_request: Request, file: UploadFile = File(..., alias="resume")):
     """Upload and parse a resume file"""
     try:
         logger.info(f"Received file upload: {file.filename}, content_type: {file.content_type}, size: {file.size}")
@@ -335,7 +345,7 @@ async def upload_resume(file: UploadFile = File(..., alias="resume")):
             raise HTTPException(status_code=400, detail="Could not extract text from the uploaded file.")
         
         # Parse resume with AI
-        parsed_data = await parse_resume_with_ai(text_content)
+        parsed_data = await parse_resume_with_ai(text_content, http_request.state.client_id)
         
         # Generate unique ID and store resume
         resume_id = str(uuid.uuid4())
@@ -377,7 +387,7 @@ async def delete_resume(resume_id: str):
     return {"success": True, "message": "Resume deleted successfully"}
 
 @app.post("/api/generate-answer", response_model=InterviewResponse)
-async def generate_ai_feedback(request: InterviewRequest):
+async def generate_ai_feedback(request: InterviewRequest, http_request: Request):
     """Generate AI feedback for user's interview answer"""
     try:
         if not request.user_answer or not request.question:
@@ -409,37 +419,42 @@ Please provide:
 Keep the response concise, constructive, and helpful. Format it as a coaching response."""
 
         # Try to use Ollama with Llama3
+        used_fallback = False
         if ollama_client:
             try:
-                response = ollama_client.chat(
-                    model='llama3',
-                    messages=[
-                        {
-                            'role': 'system',
-                            'content': 'You are a professional interview coach who provides constructive feedback and helps candidates improve their interview skills.'
-                        },
-                        {
-                            'role': 'user',
-                            'content': prompt
-                        }
-                    ]
-                )
+                async with llm_scheduler.slot(http_request.state.client_id):
+                    response = await run_in_threadpool(
+                        ollama_client.chat,
+                        model='llama3',
+                        messages=[
+                            {
+                                'role': 'system',
+                                'content': 'You are a professional interview coach who provides constructive feedback and helps candidates improve their interview skills.'
+                            },
+                            {
+                                'role': 'user',
+                                'content': prompt
+                            }
+                        ]
+                    )
                 ai_feedback = response['message']['content']
                 logger.info("Successfully generated feedback using Ollama Llama3")
                 
             except Exception as ollama_error:
                 logger.warning(f"Ollama request failed: {ollama_error}")
                 ai_feedback = get_fallback_response(request.user_answer, request.question, request.resume_context)
+                used_fallback = True
         else:
             logger.warning("Ollama client not available, using fallback response")
             ai_feedback = get_fallback_response(request.user_answer, request.question, request.resume_context)
+            used_fallback = True
 
         return InterviewResponse(
             success=True,
             feedback=ai_feedback,
             original_answer=request.user_answer,
             question=request.question,
-            fallback=ollama_client is None
+            fallback=used_fallback
         )
 
     except Exception as e:
@@ -503,5 +518,7 @@ async def check_ollama_status():
         }
 
 if __name__ == "__main__":
+    # Prefer `python -m uvicorn main:app`: PDF extraction workers re-import the
+    # main module, so running this file directly rebuilds the app in each one
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
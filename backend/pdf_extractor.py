@@ -0,0 +1,212 @@
+"""
+PDF text extraction engine for resume uploads.
+
+Pages are extracted in parallel across worker processes (PyPDF2 is pure
+Python, so threads would serialize on the GIL), collected in page order into a
+single list that is joined once, and extraction stops as soon as the
+configured page/character budget is reached. A page that fails to extract is
+logged and contributes an empty string instead of failing the whole document.
+"""
+
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+import PyPDF2
+
+logger = logging.getLogger(__name__)
+
+# Resume parsing only needs the first few pages; anything past this budget is
+# noise for the LLM prompt and just adds upload latency.
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "10"))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "20000"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Pages handed to a worker per task. With the default (0), a character budget
+# gets one page per task so reaching it stops further pages from being
+# submitted; without a budget the pages are split evenly across the workers,
+# since every task has to re-parse the PDF.
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "0"))
+# Shorter documents are extracted serially: shipping the file to workers and
+# re-parsing it there costs more than a typical 1-3 page resume saves.
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """Return the shared worker pool, creating it on first use
+
+    The server starts the pool up front with start_executor(); lazy creation
+    only covers a pool replaced after breaking and standalone callers.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Extraction runs in a threadpool inside uvicorn, and forking a
+            # multi-threaded process can deadlock, so workers are spawned
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def _warm_up() -> None:
+    """No-op task used to make the pool spawn its workers"""
+
+
+def start_executor(workers: Optional[int] = None) -> None:
+    """Create the shared worker pool and spawn all of its workers
+
+    Spawning an interpreter per worker takes seconds on a small host, so this
+    runs at server startup rather than inside the first large upload. Workers
+    re-import the main module, so the server must be started with
+    `python -m uvicorn main:app`; `python main.py` would rebuild the whole app
+    in every worker.
+    """
+    workers = PDF_WORKERS if workers is None else workers
+    if workers <= 1:
+        return
+    executor = _get_executor(workers)
+    try:
+        # Workers are spawned on demand, one per submission while none are idle
+        for future in [executor.submit(_warm_up) for _ in range(workers)]:
+            future.result()
+    except Exception as e:
+        # Extraction still works without the pool, so don't fail server startup
+        logger.error(f"Failed to start PDF extraction workers: {e}")
+        _discard_executor(executor)
+        return
+    logger.info(f"Started {workers} PDF extraction workers")
+
+
+def _discard_executor(executor: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next call starts a fresh one"""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+
+def shutdown_executor() -> None:
+    """Shut down the shared worker pool, if one was started"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_page(reader: PyPDF2.PdfReader, index: int) -> str:
+    """Extract a single page, returning an empty string on failure"""
+    try:
+        return reader.pages[index].extract_text() or ""
+    except Exception as e:
+        logger.warning(f"Error extracting text from PDF page {index + 1}: {e}")
+        return ""
+
+
+def _extract_pages(content: bytes, indices: List[int]) -> List[Tuple[int, str]]:
+    """Worker entry point: extract the given pages from the PDF content"""
+    reader = PyPDF2.PdfReader(io.BytesIO(content))
+    return [(index, _extract_page(reader, index)) for index in indices]
+
+
+def _extract_serial(reader: PyPDF2.PdfReader, page_count: int, max_chars: int) -> List[str]:
+    """Extract pages in order in the current process until the budget is met"""
+    parts: List[str] = []
+    total = 0
+    for index in range(page_count):
+        text = _extract_page(reader, index)
+        parts.append(text)
+        total += len(text) + 1
+        if total >= max_chars:
+            break
+    return parts
+
+
+def _extract_parallel(executor: ProcessPoolExecutor, content: bytes, page_count: int,
+                      max_chars: int, workers: int, pages_per_task: int) -> List[str]:
+    """Extract pages across the worker pool until the budget is met"""
+    batches = [
+        list(range(start, min(start + pages_per_task, page_count)))
+        for start in range(0, page_count, pages_per_task)
+    ]
+
+    parts: List[str] = []
+    total = 0
+    # Keep at most one batch in flight per worker so that reaching the budget
+    # stops further work instead of just discarding already-finished pages.
+    pending = [executor.submit(_extract_pages, content, batch) for batch in batches[:workers]]
+    next_batch = len(pending)
+    while pending:
+        future = pending.pop(0)
+        for _, text in sorted(future.result()):
+            parts.append(text)
+            total += len(text) + 1
+            if total >= max_chars:
+                for remaining in pending:
+                    remaining.cancel()
+                return parts
+        if next_batch < len(batches):
+            pending.append(executor.submit(_extract_pages, content, batches[next_batch]))
+            next_batch += 1
+    return parts
+
+
+def extract_pdf_text(content: bytes,
+                     max_pages: Optional[int] = None,
+                     max_chars: Optional[int] = None,
+                     workers: Optional[int] = None,
+                     pages_per_task: Optional[int] = None,
+                     parallel_min_pages: Optional[int] = None) -> str:
+    """Extract text from PDF content within the configured page/character budget"""
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    max_chars = PDF_MAX_CHARS if max_chars is None else max_chars
+    workers = PDF_WORKERS if workers is None else workers
+    pages_per_task = PDF_PAGES_PER_TASK if pages_per_task is None else pages_per_task
+    parallel_min_pages = PDF_PARALLEL_MIN_PAGES if parallel_min_pages is None else parallel_min_pages
+
+    try:
+        reader = PyPDF2.PdfReader(io.BytesIO(content))
+        page_count = len(reader.pages)
+    except Exception as e:
+        logger.error(f"Error extracting PDF text: {e}")
+        return ""
+
+    if max_pages > 0:
+        page_count = min(page_count, max_pages)
+    if max_chars <= 0:
+        max_chars = float("inf")
+
+    if pages_per_task <= 0:
+        if max_chars != float("inf"):
+            pages_per_task = 1
+        else:
+            pages_per_task = max(1, -(-page_count // max(1, workers)))
+
+    if workers > 1 and page_count >= parallel_min_pages and page_count > pages_per_task:
+        executor = _get_executor(workers)
+        try:
+            parts = _extract_parallel(executor, content, page_count, max_chars, workers, pages_per_task)
+        except BrokenProcessPool as e:
+            logger.error(f"PDF worker pool broke, falling back to serial extraction: {e}")
+            _discard_executor(executor)
+            parts = _extract_serial(reader, page_count, max_chars)
+        except Exception as e:
+            logger.warning(f"Parallel PDF extraction failed, falling back to serial: {e}")
+            parts = _extract_serial(reader, page_count, max_chars)
+    else:
+        parts = _extract_serial(reader, page_count, max_chars)
+
+    text = "\n".join(parts) + "\n" if parts else ""
+    if max_chars != float("inf"):
+        text = text[:max_chars]
+    return text
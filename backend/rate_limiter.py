@@ -0,0 +1,417 @@
+"""
+Per-client rate limiting and fair-share scheduling for the Ollama endpoints.
+
+Requests are keyed by API key (X-API-Key header) when the key is one of the
+configured keys, and by client IP otherwise, and checked against a token
+bucket for the endpoint's tier: cheap read-only endpoints and expensive LLM
+endpoints have separate budgets. Buckets live in memory by default; set
+RATE_LIMIT_BACKEND=redis to share them across workers.
+
+Calls into Ollama additionally go through a FairShareScheduler, which caps
+concurrent LLM calls and, once that cap is reached, hands freed slots to
+waiting clients in weighted fair order so one busy client cannot starve the
+others.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+RATE_LIMIT_CHEAP_PER_MINUTE = float(os.getenv("RATE_LIMIT_CHEAP_PER_MINUTE", "120"))
+RATE_LIMIT_CHEAP_BURST = int(os.getenv("RATE_LIMIT_CHEAP_BURST", "30"))
+RATE_LIMIT_LLM_PER_MINUTE = float(os.getenv("RATE_LIMIT_LLM_PER_MINUTE", "10"))
+RATE_LIMIT_LLM_BURST = int(os.getenv("RATE_LIMIT_LLM_BURST", "3"))
+OLLAMA_MAX_CONCURRENCY = int(os.getenv("OLLAMA_MAX_CONCURRENCY", "2"))
+# Seconds a call may wait for an Ollama slot before giving up (0 waits forever).
+# The wait plus the Ollama call itself has to fit inside the frontend's 30 s
+# request timeout, or the browser gives up before the fallback arrives.
+OLLAMA_QUEUE_TIMEOUT = float(os.getenv("OLLAMA_QUEUE_TIMEOUT", "10"))
+# Comma-separated API keys that get their own buckets instead of the caller's IP
+RATE_LIMIT_API_KEYS = os.getenv("RATE_LIMIT_API_KEYS", "")
+# Comma-separated "api_key:weight" pairs, e.g. "team-a:2,team-b:1"; these keys
+# are recognised even if they are not listed in RATE_LIMIT_API_KEYS
+RATE_LIMIT_CLIENT_WEIGHTS = os.getenv("RATE_LIMIT_CLIENT_WEIGHTS", "")
+# Comma-separated addresses or CIDR ranges of reverse proxies whose
+# X-Forwarded-For header is trusted; the default covers the Vite dev proxy
+RATE_LIMIT_TRUSTED_PROXIES = os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "127.0.0.1,::1")
+
+# Endpoints that call Ollama; everything else under /api is the cheap tier
+LLM_ENDPOINTS = ("/api/generate-answer", "/api/upload-resume")
+EXEMPT_ENDPOINTS = ("/", "/api/health")
+
+# Seconds between sweeps of per-client state that no longer matters
+_PRUNE_INTERVAL = 60.0
+
+
+@dataclass
+class RateLimitTier:
+    name: str
+    capacity: int
+    refill_per_second: float
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: int
+    retry_after: int
+
+
+CHEAP_TIER = RateLimitTier("cheap", RATE_LIMIT_CHEAP_BURST, RATE_LIMIT_CHEAP_PER_MINUTE / 60)
+LLM_TIER = RateLimitTier("llm", RATE_LIMIT_LLM_BURST, RATE_LIMIT_LLM_PER_MINUTE / 60)
+
+
+def parse_client_weights(value: str) -> Dict[str, float]:
+    """Parse "key:weight,key:weight" into a weight mapping"""
+    weights: Dict[str, float] = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        key, _, weight = item.rpartition(":")
+        try:
+            value = float(weight)
+        except ValueError:
+            value = math.nan
+        if not key.strip() or not math.isfinite(value) or value <= 0:
+            logger.warning(f"Ignoring invalid rate limit weight entry: {item}")
+            continue
+        weights[f"key:{key.strip()}"] = value
+    return weights
+
+
+CLIENT_WEIGHTS = parse_client_weights(RATE_LIMIT_CLIENT_WEIGHTS)
+KNOWN_CLIENT_IDS = {
+    f"key:{key.strip()}" for key in RATE_LIMIT_API_KEYS.split(",") if key.strip()
+} | set(CLIENT_WEIGHTS)
+
+
+def parse_trusted_proxies(value: str) -> List[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]]:
+    """Parse comma-separated addresses/CIDR ranges into networks"""
+    networks = []
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        try:
+            networks.append(ipaddress.ip_network(item.strip(), strict=False))
+        except ValueError:
+            logger.warning(f"Ignoring invalid trusted proxy entry: {item}")
+    return networks
+
+
+TRUSTED_PROXIES = parse_trusted_proxies(RATE_LIMIT_TRUSTED_PROXIES)
+
+
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in TRUSTED_PROXIES)
+
+
+def get_client_ip(request: Request) -> str:
+    """Return the client IP, following X-Forwarded-For through trusted proxies"""
+    host = request.client.host if request.client else "unknown"
+    forwarded_for = request.headers.get("x-forwarded-for")
+    if not forwarded_for or not _is_trusted_proxy(host):
+        return host
+    # Walk the chain from the nearest hop; the first address not added by one
+    # of our own proxies is the client, anything further left can be spoofed
+    hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else host
+
+
+def get_client_id(request: Request) -> str:
+    """Identify the caller by a configured API key, falling back to client IP"""
+    api_key = request.headers.get("x-api-key")
+    # Unknown keys are ignored, otherwise every new key would get a fresh bucket
+    if api_key and f"key:{api_key}" in KNOWN_CLIENT_IDS:
+        return f"key:{api_key}"
+    return f"ip:{get_client_ip(request)}"
+
+
+def get_tier(path: str) -> Optional[RateLimitTier]:
+    """Return the rate limit tier for a path, or None if it is not limited"""
+    if path in EXEMPT_ENDPOINTS or not path.startswith("/api/"):
+        return None
+    if path.startswith(LLM_ENDPOINTS):
+        return LLM_TIER
+    return CHEAP_TIER
+
+
+def _build_result(allowed: bool, tokens: float, tier: RateLimitTier, cost: float) -> RateLimitResult:
+    rate = tier.refill_per_second
+    if rate > 0:
+        reset_after = math.ceil((tier.capacity - tokens) / rate)
+        retry_after = 0 if allowed else math.ceil((cost - tokens) / rate)
+    else:
+        reset_after = retry_after = 0
+    return RateLimitResult(
+        allowed=allowed,
+        limit=tier.capacity,
+        remaining=max(0, int(tokens)),
+        reset_after=max(0, reset_after),
+        retry_after=max(0, retry_after),
+    )
+
+
+class RateLimitBackend:
+    """Token bucket storage; subclass to share buckets between processes"""
+
+    async def consume(self, key: str, tier: RateLimitTier, cost: float = 1.0) -> RateLimitResult:
+        raise NotImplementedError
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Token buckets kept in this process"""
+
+    def __init__(self):
+        # key -> (tokens, last update, time at which the bucket is full again)
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+        self._lock = threading.Lock()
+        self._next_prune = time.monotonic() + _PRUNE_INTERVAL
+
+    async def consume(self, key: str, tier: RateLimitTier, cost: float = 1.0) -> RateLimitResult:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated, _ = self._buckets.get(key, (tier.capacity, now, now))
+            tokens = min(tier.capacity, tokens + (now - updated) * tier.refill_per_second)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            if tier.refill_per_second > 0:
+                full_at = now + (tier.capacity - tokens) / tier.refill_per_second
+            else:
+                full_at = math.inf
+            self._buckets[key] = (tokens, now, full_at)
+            if now >= self._next_prune:
+                self._prune(now)
+        return _build_result(allowed, tokens, tier, cost)
+
+    def _prune(self, now: float) -> None:
+        # A bucket that has refilled completely is the same as no bucket
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items() if bucket[2] > now
+        }
+        self._next_prune = now + _PRUNE_INTERVAL
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Token buckets shared through Redis, updated atomically with a Lua script"""
+
+    _SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(data[1]) or capacity
+local ts = tonumber(data[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+if rate > 0 then
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+end
+return {allowed, tostring(tokens)}
+"""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis  # Optional dependency: pip install redis
+
+        self._redis = redis.from_url(url)
+        self._script = self._redis.register_script(self._SCRIPT)
+
+    async def consume(self, key: str, tier: RateLimitTier, cost: float = 1.0) -> RateLimitResult:
+        allowed, tokens = await self._script(
+            keys=[f"ratelimit:{key}"],
+            args=[tier.capacity, tier.refill_per_second, cost],
+        )
+        return _build_result(bool(allowed), float(tokens), tier, cost)
+
+
+def create_backend() -> RateLimitBackend:
+    """Build the configured backend, falling back to in-memory storage"""
+    if RATE_LIMIT_BACKEND == "redis":
+        try:
+            backend = RedisRateLimitBackend(REDIS_URL)
+            logger.info("Rate limiting using Redis backend")
+            return backend
+        except Exception as e:
+            logger.error(f"Failed to initialize Redis rate limit backend: {e}")
+    return InMemoryRateLimitBackend()
+
+
+def rate_limit_headers(result: RateLimitResult) -> Dict[str, str]:
+    headers = {
+        "X-RateLimit-Limit": str(result.limit),
+        "X-RateLimit-Remaining": str(result.remaining),
+        "X-RateLimit-Reset": str(result.reset_after),
+    }
+    if not result.allowed:
+        headers["Retry-After"] = str(result.retry_after)
+    return headers
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """Reject requests over their client's budget and add rate limit headers"""
+
+    def __init__(self, app, backend: RateLimitBackend):
+        super().__init__(app)
+        self.backend = backend
+
+    async def dispatch(self, request: Request, call_next):
+        client_id = get_client_id(request)
+        request.state.client_id = client_id
+
+        tier = get_tier(request.url.path)
+        if not RATE_LIMIT_ENABLED or tier is None or request.method == "OPTIONS":
+            return await call_next(request)
+
+        try:
+            result = await self.backend.consume(f"{tier.name}:{client_id}", tier)
+        except Exception as e:
+            # Fail open: a broken shared store should not take the API down
+            logger.error(f"Rate limit backend error: {e}")
+            return await call_next(request)
+
+        headers = rate_limit_headers(result)
+        if not result.allowed:
+            logger.warning(f"Rate limit exceeded for {client_id} on {request.url.path}")
+            return JSONResponse(
+                status_code=429,
+                content={"detail": "Too many requests. Please try again later."},
+                headers=headers,
+            )
+
+        response = await call_next(request)
+        response.headers.update(headers)
+        return response
+
+
+class LLMQueueTimeout(Exception):
+    """Raised when a call waits too long for a free LLM slot"""
+
+
+class FairShareScheduler:
+    """Limit concurrent LLM calls and share slots fairly once saturated
+
+    Uses start-time fair queuing: each client carries a virtual finish time
+    that advances by 1/weight per call, and a freed slot goes to the waiting
+    client with the earliest start time. Idle clients cannot bank credit since
+    start times never fall behind the scheduler's virtual clock.
+
+    State is local to the process, so with several server workers the
+    concurrency cap applies per worker.
+    """
+
+    def __init__(self, max_concurrency: int, weights: Optional[Dict[str, float]] = None,
+                 queue_timeout: Optional[float] = None):
+        self.max_concurrency = max(1, max_concurrency)
+        self.weights = weights or {}
+        self.queue_timeout = queue_timeout if queue_timeout and queue_timeout > 0 else None
+        self._active = 0
+        self._clock = 0.0
+        self._finish: Dict[str, float] = {}
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {}
+        self._next_prune = time.monotonic() + _PRUNE_INTERVAL
+
+    def _start(self, client_id: str) -> None:
+        start = max(self._finish.get(client_id, 0.0), self._clock)
+        self._clock = start
+        self._finish[client_id] = start + 1.0 / self.weights.get(client_id, 1.0)
+        self._active += 1
+
+    def _dispatch(self) -> None:
+        while self._active < self.max_concurrency and self._waiters:
+            client_id = min(
+                self._waiters,
+                key=lambda c: max(self._finish.get(c, 0.0), self._clock),
+            )
+            queue = self._waiters[client_id]
+            future = queue.popleft()
+            if not queue:
+                del self._waiters[client_id]
+            if future.done():
+                continue
+            self._start(client_id)
+            future.set_result(None)
+
+        now = time.monotonic()
+        if now >= self._next_prune:
+            # Finish times at or behind the clock no longer affect ordering
+            self._finish = {
+                c: finish for c, finish in self._finish.items()
+                if finish > self._clock or c in self._waiters
+            }
+            self._next_prune = now + _PRUNE_INTERVAL
+
+    async def acquire(self, client_id: str) -> None:
+        if self._active < self.max_concurrency and not self._waiters:
+            self._start(client_id)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(client_id, deque()).append(future)
+        try:
+            await asyncio.wait({future}, timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted just as we were cancelled; hand it on
+                self.release()
+            else:
+                self._abandon(client_id, future)
+            raise
+        if not future.done():
+            self._abandon(client_id, future)
+            raise LLMQueueTimeout(f"Timed out after {self.queue_timeout:g}s waiting for an LLM slot")
+
+    def _abandon(self, client_id: str, future: asyncio.Future) -> None:
+        future.cancel()
+        queue = self._waiters.get(client_id)
+        if queue is not None and future in queue:
+            queue.remove(future)
+            if not queue:
+                del self._waiters[client_id]
+
+    def release(self) -> None:
+        self._active -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, client_id: str):
+        await self.acquire(client_id)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+llm_scheduler = FairShareScheduler(OLLAMA_MAX_CONCURRENCY, CLIENT_WEIGHTS, OLLAMA_QUEUE_TIMEOUT)
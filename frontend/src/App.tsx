@@ -7,7 +7,7 @@ import AnswerDisplay from './components/AnswerDisplay';
 import ResumeUpload from './components/ResumeUpload';
 import OllamaStatus from './components/OllamaStatus';
 import { InterviewMode, QuestionResponse, InterviewResponse, ResumeData } from './types';
-import { apiService } from './services/api';
+import { apiService, getRateLimitMessage } from './services/api';
 
 function App() {
   const [currentMode, setCurrentMode] = useState<InterviewMode>('hr');
@@ -32,7 +32,7 @@ function App() {
       setUserAnswer('');
       setAiFeedback(null);
     } catch (err) {
-      setError('Failed to load question. Please try again.');
+      setError(getRateLimitMessage(err) ?? 'Failed to load question. Please try again.');
       console.error('Error loading question:', err);
     } finally {
       setIsLoading(false);
@@ -64,7 +64,7 @@ function App() {
 
       setAiFeedback(response);
     } catch (err) {
-      setError('Failed to get AI feedback. Please try again.');
+      setError(getRateLimitMessage(err) ?? 'Failed to get AI feedback. Please try again.');
       console.error('Error getting feedback:', err);
     } finally {
       setIsLoading(false);
@@ -1,7 +1,7 @@
 import React, { useState, useRef } from 'react';
 import { Upload, FileText, X, CheckCircle, AlertCircle, Loader, Eye } from 'lucide-react';
 import { ResumeData, ResumeUploadResponse } from '../types';
-import { apiService } from '../services/api';
+import { apiService, getRateLimitMessage } from '../services/api';
 import ResumeDisplay from './ResumeDisplay';
 
 interface ResumeUploadProps {
@@ -64,7 +64,7 @@ const ResumeUpload: React.FC<ResumeUploadProps> = ({ onResumeUploaded, currentRe
       }
     } catch (error) {
       console.error('Resume upload error:', error);
-      setUploadError('Failed to upload resume. Please try again.');
+      setUploadError(getRateLimitMessage(error) ?? 'Failed to upload resume. Please try again.');
     } finally {
       setIsUploading(false);
     }
@@ -26,11 +26,27 @@ api.interceptors.response.use(
     return response;
   },
   (error) => {
-    console.error('API Error:', error.response?.data || error.message);
+    if (error.response?.status === 429) {
+      console.warn(`Rate limited, retry after ${error.response.headers['retry-after'] ?? '?'}s`);
+    } else {
+      console.error('API Error:', error.response?.data || error.message);
+    }
     return Promise.reject(error);
   }
 );
 
+// Returns a user-facing message for a rate-limited (429) request, or null for any other error
+export const getRateLimitMessage = (error: unknown): string | null => {
+  if (!axios.isAxiosError(error) || error.response?.status !== 429) {
+    return null;
+  }
+  const retryAfter = Number(error.response?.headers['retry-after']);
+  if (Number.isFinite(retryAfter) && retryAfter > 0) {
+    return `Too many requests. Please wait ${retryAfter} second${retryAfter === 1 ? '' : 's'} and try again.`;
+  }
+  return 'Too many requests. Please wait a moment and try again.';
+};
+
 export const apiService = {
   // Health check
   async healthCheck(): Promise<{ status: string; message: string }> {
@@ -10,6 +10,8 @@ export default defineConfig({
       '/api': {
         target: 'http://localhost:8000',
         changeOrigin: true,
+        // Forward the browser's address so the backend rate-limits per client
+        xfwd: true,
       },
     },
   },